@@ -1,9 +1,73 @@
 import struct
 import json
+import re
+import mmap
+import os
+import tempfile
 from pathlib import Path
 from enum import Enum
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import orjson  # optional, noticeably faster JSON load/dump
+except ImportError:
+    orjson = None
+
+# 0x04, length byte, 0x00 0x00 0x00 -- matched in C so Python only sees candidates
+STRING_HEADER = re.compile(rb'\x04.\x00\x00\x00', re.DOTALL)
+# Same header unpacked in one call: marker byte, length byte, 3 padding bytes
+HEADER_STRUCT = struct.Struct('<BB3s')
+HEADER_PADDING = b'\x00\x00\x00'
+
+def _init_worker(level: int) -> None:
+    """Pool initializer: spawned workers start without the parent's logging setup."""
+    logging.basicConfig(level=level)
+
+def _load_json(path: Path):
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with path.open('r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_json_array(entries: Iterable, path: Path) -> int:
+    """
+    Stream 'entries' to 'path' as a readable UTF-8 JSON array, one entry at a time,
+    using orjson when it is installed. The file is only (re)placed once every entry
+    has been written, and not at all if there are none.
+    Returns the number of entries written.
+    """
+    if orjson is not None:
+        indent = b'  '
+        dump = lambda entry: orjson.dumps(entry, option=orjson.OPT_INDENT_2)
+    else:
+        indent = b'    '
+        dump = lambda entry: json.dumps(entry, indent=4, ensure_ascii=False).encode('utf-8')
+    
+    # A unique temp file per writer, so no one else can truncate or move it
+    f = tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + '.',
+                                    suffix='.tmp', delete=False)
+    tmp_path = Path(f.name)
+    count = 0
+    try:
+        with f:
+            for entry in entries:
+                f.write(b'[\n' if count == 0 else b',\n')
+                f.write(indent + dump(entry).replace(b'\n', b'\n' + indent))
+                count += 1
+            f.write(b'\n]')
+        if count:
+            # mkstemp creates 0600 files; give the JSON the usual umask-based mode
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+            os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return count
 
 class Mode(Enum):
     EXTRACT = 'extract'
@@ -46,16 +110,17 @@ class StringTool:
             return False, 0, 0, 0
         
         # Check pattern 0x04, 0x00 0x00 0x00 at right positions
-        if data[offset] != 0x04 or data[offset+2:offset+5] != b'\x00\x00\x00':
+        marker, specified_length, padding = HEADER_STRUCT.unpack_from(data, offset)
+        if marker != 0x04 or padding != HEADER_PADDING:
             return False, 0, 0, 0
             
-        specified_length = data[offset+1]  # includes null terminator
+        # specified_length includes the null terminator
         str_start = offset + 5
-        str_end = str_start
         
         # Find the null terminator
-        while str_end < len(data) and data[str_end] != 0:
-            str_end += 1
+        str_end = data.find(b'\x00', str_start)
+        if str_end < 0:
+            str_end = len(data)
             
         actual_length = (str_end - str_start) + 1  # +1 for the null terminator
         
@@ -64,29 +129,35 @@ class StringTool:
             
         return True, specified_length, str_start, str_end
 
-    def extract_strings(self, binary_file_path: Path) -> List[Dict[str, str]]:
+    def extract_strings(self, binary_file_path: Path) -> Iterator[Dict[str, str]]:
         """
         Extract strings from binary file using the known pattern.
-        Returns a list of dicts like [{'orig': '...', 'trans': '...'}, ...].
+        Yields dicts like {'orig': '...', 'trans': '...'} in file order.
         """
-        data = binary_file_path.read_bytes()
-        results = []
-        offset = 0
-        
-        while offset < len(data):
-            valid, length, str_start, str_end = self._find_string_pattern(data, offset)
-            if valid:
-                try:
-                    # decode the string (excluding the null terminator)
-                    original_str = data[str_start:str_end].decode(self.encoding)
-                    results.append({'orig': original_str, 'trans': original_str})
-                    offset = str_end + 1  # skip past the null terminator
-                    continue
-                except UnicodeDecodeError:
-                    self.logger.warning(f"Failed to decode string at offset {str_start}.")
-            offset += 1
-        
-        return results
+        with binary_file_path.open('rb') as f:
+            if f.seek(0, 2) == 0:  # mmap refuses to map an empty file
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = 0
+                
+                while True:
+                    # Jump straight to the next candidate header
+                    match = STRING_HEADER.search(data, offset)
+                    if match is None:
+                        break
+                    offset = match.start()
+                    valid, length, str_start, str_end = self._find_string_pattern(data, offset)
+                    if valid:
+                        try:
+                            # decode the string (excluding the null terminator)
+                            original_str = data[str_start:str_end].decode(self.encoding)
+                        except UnicodeDecodeError:
+                            self.logger.warning(f"Failed to decode string at offset {str_start}.")
+                        else:
+                            yield {'orig': original_str, 'trans': original_str}
+                            offset = str_end + 1  # skip past the null terminator
+                            continue
+                    offset += 1
 
     def replace_strings(self,
                         binary_file_path: Path,
@@ -98,42 +169,56 @@ class StringTool:
         Raises a warning if not all translations are used or if the new strings exceed
         the original pattern's length.
         """
-        data = bytearray(binary_file_path.read_bytes())
+        # Read straight into the mutable buffer instead of copying a bytes object
+        data = bytearray(binary_file_path.stat().st_size)
+        with binary_file_path.open('rb') as f:
+            f.readinto(data)
         offset = 0
         trans_index = 0
         
-        while offset < len(data) and trans_index < len(translations):
+        # Encode every entry once so the scan below compares raw bytes
+        orig_bytes = [entry['orig'].encode(self.encoding) for entry in translations]
+        trans_bytes = [entry['trans'].encode(self.encoding) for entry in translations]
+        
+        while trans_index < len(translations):
+            # Jump straight to the next candidate header
+            match = STRING_HEADER.search(data, offset)
+            if match is None:
+                break
+            offset = match.start()
             valid, old_len, str_start, str_end = self._find_string_pattern(data, offset)
             if valid:
-                old_str = None
-                try:
-                    old_str = data[str_start:str_end].decode(self.encoding)
-                except UnicodeDecodeError:
-                    self.logger.warning(f"Failed to decode original string at offset {str_start}.")
+                old_bytes = data[str_start:str_end]
+                matched = old_bytes == orig_bytes[trans_index]
+                if not matched:
+                    # cp932 maps some characters twice, so fall back to comparing the text
+                    try:
+                        old_str = old_bytes.decode(self.encoding)
+                        matched = translations[trans_index]['orig'] == old_str
+                    except UnicodeDecodeError:
+                        self.logger.warning(f"Failed to decode original string at offset {str_start}.")
                 
-                if old_str is not None:
-                    trans_entry = translations[trans_index]
-                    if trans_entry['orig'] == old_str:
-                        # Prepare the new string
-                        new_bytes = trans_entry['trans'].encode(self.encoding)
-                        new_len = len(new_bytes) + 1  # account for null terminator
-                        
-                        # Check if new length exceeds old length
-                        if new_len > old_len:
-                            self.logger.warning(
-                                f"New string length ({new_len}) exceeds old length ({old_len}). "
-                                f"Possible data corruption at offset {offset}."
-                            )
-                            
-                        # Rewrite length byte
-                        data[offset + 1] = new_len
-                        # Overwrite with new bytes
-                        data[str_start:str_end] = new_bytes
+                if matched:
+                    # Prepare the new string
+                    new_bytes = trans_bytes[trans_index]
+                    new_len = len(new_bytes) + 1  # account for null terminator
+                    
+                    # Check if new length exceeds old length
+                    if new_len > old_len:
+                        self.logger.warning(
+                            f"New string length ({new_len}) exceeds old length ({old_len}). "
+                            f"Possible data corruption at offset {offset}."
+                        )
                         
-                        # Move offset forward
-                        offset = str_start + new_len
-                        trans_index += 1
-                        continue
+                    # Rewrite length byte
+                    data[offset + 1] = new_len
+                    # Overwrite with new bytes
+                    data[str_start:str_end] = new_bytes
+                    
+                    # Move offset forward
+                    offset = str_start + new_len
+                    trans_index += 1
+                    continue
             offset += 1
         
         # Check if all translations were used
@@ -144,38 +229,85 @@ class StringTool:
         
         output_file_path.write_bytes(data)
 
+    def _extract_file(self, file_path: Path) -> int:
+        """
+        Extract strings from one .scb file into 'json_files'.
+        Returns the number of strings written (0 means no JSON was created).
+        """
+        json_path = self.json_dir / f"{file_path.stem}.json"
+        return _write_json_array(self.extract_strings(file_path), json_path)
+
+    def _extract_group(self, file_paths: List[Path]) -> List[Tuple[Path, int, Optional[Exception]]]:
+        """
+        Extract .scb files that share a stem one after another, in the given order,
+        because they all write the same JSON file (the last one processed wins).
+        Returns (file_path, string_count, error) for each file.
+        """
+        results = []
+        for file_path in file_paths:
+            try:
+                results.append((file_path, self._extract_file(file_path), None))
+            except Exception as e:
+                results.append((file_path, 0, e))
+        return results
+
+    def _replace_file(self, json_path: Path) -> Optional[Path]:
+        """
+        Apply one JSON file to its matching .scb and write it to 'output_files'.
+        Returns the binary path that was patched, or None if there is no match.
+        """
+        binary_path = self.input_dir / f"{json_path.stem}.scb"
+        if not binary_path.exists():
+            return None
+        translations = _load_json(json_path)
+        
+        output_file = self.output_dir / binary_path.name
+        self.replace_strings(binary_path, translations, output_file)
+        return binary_path
+
     def process_files(self, mode: Mode) -> None:
         """
         Process all .scb files in 'input_files' directory.
         If mode=EXTRACT, create JSON files in 'json_files'.
         If mode=REPLACE, read JSON from 'json_files' and write modified .scb to 'output_files'.
+        Each output file is produced by a separate worker process. Inputs that share
+        a stem map to the same JSON, so they are extracted together, in glob order.
         """
-        if mode == Mode.EXTRACT:
-            for file_path in self.input_dir.glob('**/*.scb'):
-                try:
-                    strings = self.extract_strings(file_path)
-                    if strings:
-                        json_path = self.json_dir / f"{file_path.stem}.json"
-                        with json_path.open('w', encoding='utf-8') as f:
-                            json.dump(strings, f, indent=4, ensure_ascii=False)
-                        self.logger.info(f"Extracted {len(strings)} strings from {file_path.name}")
-                except Exception as e:
-                    self.logger.error(f"Error extracting from {file_path}: {e}")
-        else:  # Mode.REPLACE
-            for json_path in self.json_dir.glob('*.json'):
-                try:
-                    binary_path = self.input_dir / f"{json_path.stem}.scb"
-                    if not binary_path.exists():
-                        self.logger.warning(f"No matching binary found for {json_path.stem}.")
-                        continue
-                    with json_path.open('r', encoding='utf-8') as f:
-                        translations = json.load(f)
-                    
-                    output_file = self.output_dir / binary_path.name
-                    self.replace_strings(binary_path, translations, output_file)
-                    self.logger.info(f"Replaced strings in {binary_path.name}")
-                except Exception as e:
-                    self.logger.error(f"Error replacing from {json_path}: {e}")
+        with ProcessPoolExecutor(initializer=_init_worker,
+                                 initargs=(logging.getLogger().level,)) as pool:
+            if mode == Mode.EXTRACT:
+                groups: Dict[str, List[Path]] = {}
+                for file_path in self.input_dir.glob('**/*.scb'):
+                    groups.setdefault(file_path.stem, []).append(file_path)
+                for stem, file_paths in groups.items():
+                    if len(file_paths) > 1:
+                        self.logger.warning(
+                            f"{len(file_paths)} files are named {stem}.scb; they all extract to "
+                            f"{stem}.json and the last one processed wins: "
+                            + ", ".join(str(p) for p in file_paths)
+                        )
+                
+                jobs = [pool.submit(self._extract_group, file_paths)
+                        for file_paths in groups.values()]
+                for job in as_completed(jobs):
+                    for file_path, count, error in job.result():
+                        if error is not None:
+                            self.logger.error(f"Error extracting from {file_path}: {error}")
+                        elif count:
+                            self.logger.info(f"Extracted {count} strings from {file_path.name}")
+            else:  # Mode.REPLACE
+                jobs = {pool.submit(self._replace_file, json_path): json_path
+                        for json_path in self.json_dir.glob('*.json')}
+                for job in as_completed(jobs):
+                    json_path = jobs[job]
+                    try:
+                        binary_path = job.result()
+                        if binary_path is None:
+                            self.logger.warning(f"No matching binary found for {json_path.stem}.")
+                            continue
+                        self.logger.info(f"Replaced strings in {binary_path.name}")
+                    except Exception as e:
+                        self.logger.error(f"Error replacing from {json_path}: {e}")
 
 
 def main():